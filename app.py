@@ -1,21 +1,29 @@
 import asyncio
 import base64
+import functools
+import importlib
 import json
+import logging
 import os
 import random
-import sys
-import tempfile
-from typing import Optional, Tuple
+from contextlib import asynccontextmanager, suppress
+from typing import Annotated, Optional, Tuple
 
 import httpx
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import HTMLResponse, JSONResponse
 from jinja2 import Template
 
-from fastapi_mcp import FastApiMCP
-
 from pydantic import BaseModel, Field
 
+import complexity
+import executor
+from dispatch import RunnerPool
+from metrics import LoopLagMonitor
+from snapshot import SnapshotReader, slug_of
+
 
 class ExecRequest(BaseModel):
     code: str | None = Field(
@@ -28,17 +36,88 @@ class ExecRequest(BaseModel):
     sampleCase: str | None = Field(None, description="LeetCode sample case string")
 
 
-app = FastAPI()
+class ExecuteRequest(ExecRequest):
+    profile: bool = Field(False, description="Profile a Python run and return its hotspots")
+    profileTop: int = Field(10, ge=1, le=100, description="Number of hotspots to return per category")
+
+
+class SizedInput(BaseModel):
+    size: int = Field(..., ge=1, description="Problem size n this input represents")
+    input: str = Field(..., description="Standard input for this run")
+
+
+class ComplexityRequest(ExecRequest):
+    sizes: list[Annotated[int, Field(ge=1)]] | None = Field(
+        None, description="Sizes to scale the sample input to (defaults to 1000..32000)"
+    )
+    inputs: list[SizedInput] | None = Field(
+        None, description="Explicit inputs to use instead of scaling the sample"
+    )
+
+
+# Guards for /complexity so one request cannot monopolise an execution slot.
+MAX_PROFILE_RUNS = 12
+MAX_PROFILE_SIZE = 1_000_000
+# Elements generated across all scaled inputs of a request, counting the
+# width of nested rows and strings.
+MAX_PROFILE_ELEMENTS = 4_000_000
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = LoopLagMonitor()
+
+# Remote runner processes (`python runner.py`) to dispatch executions to,
+# e.g. "http://10.0.0.5:9001,unix:///run/runner.sock"; unset runs locally.
+RUNNERS = RunnerPool.from_env(os.environ.get("CODE_TRAINER_RUNNERS"))
+
+
+async def _deferred_startup() -> None:
+    """Warm caches and mount MCP after the server has started accepting requests."""
+    try:
+        await asyncio.to_thread(_warm_up)
+        await mount_mcp()
+    except Exception:
+        logger.exception("Deferred startup failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    LOOP_LAG.start()
+    if RUNNERS is None:
+        await asyncio.to_thread(executor.WORKSPACES.prewarm)
+    deferred = asyncio.create_task(_deferred_startup())
+    yield
+    deferred.cancel()
+    with suppress(asyncio.CancelledError):
+        await deferred
+    await LOOP_LAG.stop()
+    if RUNNERS is not None:
+        await RUNNERS.aclose()
+    await asyncio.to_thread(executor.WORKSPACES.close)
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Mounted lazily by mount_mcp() so that importing the app stays cheap.
+mcp_server = None
+
+PROBLEMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "problems.json")
 
 
-# Load problems from local file as a fallback
-with open("problems.json") as f:
-    LOCAL_PROBLEMS = json.load(f)
+@functools.cache
+def local_problems() -> list[dict]:
+    """Load the fallback problems shipped next to this module."""
+    with open(PROBLEMS_PATH) as f:
+        return json.load(f)
 
 LEETCODE_API = "https://leetcode.com/api/problems/all/"
 
 GRAPHQL_API = "https://leetcode.com/graphql"
 
+# Optional shared snapshot published by `python snapshot.py PATH`; when set,
+# workers serve the catalog and details from it instead of calling LeetCode.
+SNAPSHOT_PATH = os.environ.get("CODE_TRAINER_SNAPSHOT")
+SNAPSHOT = SnapshotReader(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
 
 
 INDEX_HTML = """
@@ -131,8 +210,12 @@ INDEX_HTML = """
           <textarea id="code-editor" name="code" rows="10" placeholder="print('hello')"></textarea>
           <button type="button" id="reset-code-btn" class="btn btn-outline-primary me-2">Reset</button>
           <button type="submit" class="btn btn-primary">Run Code</button>
+          <label class="ms-3"><input type="checkbox" id="profile-toggle" name="profile"> Profile (Python)</label>
         </form>
-        <pre id="output" class="bg-dark text-white p-3 mt-3"></pre>
+        <div class="row">
+          <div class="col"><pre id="output" class="bg-dark text-white p-3 mt-3"></pre></div>
+          <div class="col hidden" id="profile-area"><pre id="profile-output" class="bg-light p-3 mt-3"></pre></div>
+        </div>
       </div>
       <script id="snippets-data" type="application/json">{{ snippets_b64 }}</script>
     <script>
@@ -179,12 +262,26 @@ INDEX_HTML = """
           const language=e.target.language.value;
           const sampleCaseEl=document.getElementById('sample-case');
           const sampleCase=sampleCaseEl?sampleCaseEl.value:'';
-          const resp=await fetch('/execute',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({code,language,sampleCase})});
+          const profile=e.target.profile.checked&&language==='python';
+          const resp=await fetch('/execute',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({code,language,sampleCase,profile})});
           const data=await resp.json();
-          let output=data.stdout+data.stderr;
+          let output=data.error?data.error:data.stdout+data.stderr;
           if(typeof data.passed!=='undefined'){output+='\\nPassed: '+data.passed;}
           document.getElementById('output').textContent=output;
+          renderProfile(data.profile);
         });
+        function renderProfile(p){
+          const area=document.getElementById('profile-area');
+          area.classList.toggle('hidden',!p);
+          if(!p) return;
+          const out=['CPU '+p.cpu_ms+' ms, peak memory '+p.memory.peak_kb+' KB','','Functions (cumulative ms):'];
+          for(const f of p.functions){out.push('  '+f.cumulative_ms+'  '+f.function+' ('+f.file+':'+f.line+') x'+f.calls);}
+          out.push('','Lines (cumulative ms):');
+          for(const l of p.lines){out.push('  '+l.cumulative_ms+'  L'+l.line+': '+l.source);}
+          out.push('','Allocations near peak (KB):');
+          for(const a of p.memory.top){out.push('  '+a.size_kb+'  L'+a.line+': '+a.source);}
+          document.getElementById('profile-output').textContent=out.join('\\n');
+        }
         document.getElementById('copy-code-btn').addEventListener('click',()=>{
           navigator.clipboard.writeText(document.getElementById('code-editor').value)
             .then(()=>{const fb=document.getElementById('copy-feedback');fb.classList.remove('hidden');setTimeout(()=>fb.classList.add('hidden'),2000);})
@@ -199,8 +296,29 @@ INDEX_HTML = """
 
 SOLVE_HTML = INDEX_HTML
 
-TEMPLATE = Template(INDEX_HTML)
-SOLVE_TEMPLATE = Template(SOLVE_HTML)
+
+
+@functools.cache
+def get_template(source: str) -> Template:
+    """Compile ``source`` on first use and reuse the result afterwards."""
+    return Template(source)
+
+
+def _warm_up() -> None:
+    local_problems()
+    get_template(INDEX_HTML)
+    get_template(SOLVE_HTML)
+
+
+def __getattr__(name: str):
+    # Module-level names kept for callers that predate lazy loading.
+    if name == "LOCAL_PROBLEMS":
+        return local_problems()
+    if name == "TEMPLATE":
+        return get_template(INDEX_HTML)
+    if name == "SOLVE_TEMPLATE":
+        return get_template(SOLVE_HTML)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def parse_sample_test_case(case: str) -> tuple[str, str]:
@@ -227,6 +345,15 @@ def generate_template(language: str) -> str:
     }
 
 async def fetch_problem_detail(slug: str) -> dict:
+    """Retrieve problem details from the shared snapshot or LeetCode."""
+    if SNAPSHOT is not None and await SNAPSHOT.poll():
+        detail = SNAPSHOT.detail(slug)
+        if detail is not None:
+            return detail
+    return await fetch_remote_problem_detail(slug)
+
+
+async def fetch_remote_problem_detail(slug: str) -> dict:
     """Retrieve problem content and sample test case from LeetCode."""
     query = (
         "query getQuestion($titleSlug: String!) {\n"
@@ -268,8 +395,46 @@ async def inject_snippets(problem: dict) -> None:
             {"lang": "Go", "langSlug": "go", "code": generate_template("go")},
         ]
 
+def _render_page(source: str, problem: Optional[dict]) -> str:
+    snippets_b64 = ""
+    if problem:
+        snippets_b64 = base64.b64encode(json.dumps(problem["codeSnippets"]).encode()).decode()
+    return get_template(source).render(problem=problem, snippets_b64=snippets_b64)
+
+
+async def render_page(source: str, problem: Optional[dict]) -> HTMLResponse:
+    """Encode snippets and render the template ``source`` in a worker thread."""
+    return HTMLResponse(await asyncio.to_thread(_render_page, source, problem))
+
+
 async def fetch_problems() -> list[dict]:
+    """Return the problem list from the shared snapshot or LeetCode."""
+    if SNAPSHOT is not None and await SNAPSHOT.poll():
+        return SNAPSHOT.catalog()
+    return await fetch_remote_problems()
+
+
+async def pick_problem(difficulty: str) -> Optional[dict]:
+    """Return a copy of a random catalog entry of ``difficulty``, or ``None``."""
+    if SNAPSHOT is not None and await SNAPSHOT.poll():
+        # Decodes just the chosen entry instead of holding the catalog.
+        return SNAPSHOT.random_entry(difficulty)
+    problems = await fetch_problems()
+    matches = [p for p in problems if p["difficulty"].lower() == difficulty.lower()]
+    return random.choice(matches).copy() if matches else None
+
+
+async def find_problem(slug: str) -> Optional[dict]:
+    """Return a copy of the catalog entry for ``slug``, or ``None``."""
+    if SNAPSHOT is not None and await SNAPSHOT.poll():
+        return SNAPSHOT.entry(slug)
+    for p in await fetch_problems():
+        if slug_of(p) == slug:
+            return p.copy()
+    return None
+
 
+async def fetch_remote_problems() -> list[dict]:
     """Fetch the list of problems from LeetCode or fallback to local data."""
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
@@ -278,7 +443,7 @@ async def fetch_problems() -> list[dict]:
             resp.raise_for_status()
             data = resp.json()
         problems = []
-        local_by_id = {p["id"]: p for p in LOCAL_PROBLEMS}
+        local_by_id = {p["id"]: p for p in local_problems()}
         for item in data.get("stat_status_pairs", []):
             stat = item.get("stat", {})
             pid = stat.get("frontend_question_id")
@@ -298,52 +463,41 @@ async def fetch_problems() -> list[dict]:
             return problems
     except Exception:
         pass
-    return LOCAL_PROBLEMS
+    return local_problems()
 
 async def get_problem_by_slug(slug: str) -> Optional[dict]:
     """Return a problem dict for the given slug."""
-    problems = await fetch_problems()
-    for p in problems:
-        if p.get("url", "").rstrip("/").split("/")[-1] == slug:
-            if not p.get("content") or not p.get("codeSnippets"):
-                p.update(await fetch_problem_detail(slug))
-            p["slug"] = slug
-            return p
-    return None
+    p = await find_problem(slug)
+    if p is None:
+        return None
+    if not p.get("content") or not p.get("codeSnippets"):
+        p.update(await fetch_problem_detail(slug))
+    p["slug"] = slug
+    return p
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, difficulty: Optional[str] = None):
-    problems = await fetch_problems()
-    problem = None
-    if difficulty:
-        cand = [p for p in problems if p["difficulty"].lower() == difficulty.lower()]
-        if cand:
-            problem = random.choice(cand).copy()
-            slug = problem["url"].rstrip("/").split("/")[-1]
-            detail = await fetch_problem_detail(slug)
-            problem.update(detail)
-            problem["slug"] = slug
-    snippets_b64 = ""
+    problem = await pick_problem(difficulty) if difficulty else None
     if problem:
+        slug = slug_of(problem)
+        detail = await fetch_problem_detail(slug)
+        problem.update(detail)
+        problem["slug"] = slug
         await inject_snippets(problem)
-        snippets_b64 = base64.b64encode(json.dumps(problem["codeSnippets"]).encode()).decode()
-    return HTMLResponse(TEMPLATE.render(problem=problem, snippets_b64=snippets_b64))
+    return await render_page(INDEX_HTML, problem)
 
 
 @app.get("/random", response_class=HTMLResponse)
 async def random_problem(request: Request, difficulty: str):
-    problems = await fetch_problems()
-    matches = [p for p in problems if p["difficulty"].lower() == difficulty.lower()]
-    if not matches:
+    problem = await pick_problem(difficulty)
+    if problem is None:
         raise HTTPException(404, "No problems for difficulty")
-    problem = random.choice(matches)
-    slug = problem["url"].rstrip("/").split("/")[-1]
+    slug = slug_of(problem)
     problem.update(await fetch_problem_detail(slug))
     problem["slug"] = slug
     await inject_snippets(problem)
-    snippets_b64 = base64.b64encode(json.dumps(problem["codeSnippets"]).encode()).decode()
-    return HTMLResponse(TEMPLATE.render(problem=problem, snippets_b64=snippets_b64))
+    return await render_page(INDEX_HTML, problem)
 
 
 @app.get("/solve/{slug}", response_class=HTMLResponse)
@@ -352,42 +506,49 @@ async def solve_page(slug: str):
     if not problem:
         raise HTTPException(404, "Problem not found")
     await inject_snippets(problem)
-    snippets_b64 = base64.b64encode(json.dumps(problem["codeSnippets"]).encode()).decode()
-    return HTMLResponse(SOLVE_TEMPLATE.render(problem=problem, snippets_b64=snippets_b64))
+    return await render_page(SOLVE_HTML, problem)
 
 
-@app.post("/execute")
-async def execute_code(req: ExecRequest):
+@app.get("/metrics/loop-lag")
+async def loop_lag_metrics():
+    """Histogram of event-loop wake-up delays in milliseconds."""
+    return LOOP_LAG.snapshot()
+
+
+def _decode_code(req: ExecRequest) -> str | JSONResponse:
+    """Return the submitted source, or a 400 response if it is missing or invalid."""
     if req.code is not None:
-        code = req.code
-    elif req.codeB64 is not None:
+        return req.code
+    if req.codeB64 is not None:
         try:
-            code = base64.b64decode(req.codeB64).decode()
+            return base64.b64decode(req.codeB64).decode()
         except Exception as e:
             return JSONResponse(
                 status_code=400,
                 content={"error": f"codeB64 parse failed：{e}"},
             )
-    else:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "code or codeB64 must be provided"},
-        )
+    return JSONResponse(
+        status_code=400,
+        content={"error": "code or codeB64 must be provided"},
+    )
+
+
+@app.post("/execute")
+async def execute_code(req: ExecuteRequest):
+    code = _decode_code(req)
+    if isinstance(code, JSONResponse):
+        return code
 
     language = req.language.lower()
     sample = req.sampleCase or ""
     input_data, expected = parse_sample_test_case(sample)
 
-    if language == "python":
-        result = await _run_python(code, input_data)
-    elif language in {"cpp", "c++"}:
-        result = await _run_cpp(code, input_data)
-    elif language == "java":
-        result = await _run_java(code, input_data)
-    elif language == "go":
-        result = await _run_go(code, input_data)
-    else:
-        result = {"stdout": "", "stderr": "Unsupported language", "returncode": 1}
+    if req.profile and executor.normalize_language(language) != "python":
+        return JSONResponse(
+            status_code=400,
+            content={"error": "profiling is only supported for python"},
+        )
+    result = await run_code(language, code, input_data, req.profileTop if req.profile else 0)
 
     if expected:
         result["passed"] = (
@@ -396,131 +557,114 @@ async def execute_code(req: ExecRequest):
     return result
 
 
-
-async def _run_python(code: str, stdin: str = "") -> dict:
-    with tempfile.NamedTemporaryFile("w+", suffix=".py", delete=False) as tmp:
-        tmp.write(code)
-        tmp.flush()
-        proc = await asyncio.create_subprocess_exec(
-            sys.executable,
-            tmp.name,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        try:
-            stdout, stderr = await asyncio.wait_for(proc.communicate(stdin.encode()), timeout=15)
-        except asyncio.TimeoutError:
-            proc.kill()
-            return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
-    os.unlink(tmp.name)
-    return {
-        "stdout": stdout.decode(),
-        "stderr": stderr.decode(),
-        "returncode": proc.returncode,
-    }
-
-
-async def _run_cpp(code: str, stdin: str = "") -> dict:
-    with tempfile.TemporaryDirectory() as tmpdir:
-        src = os.path.join(tmpdir, "main.cpp")
-        exe = os.path.join(tmpdir, "main")
-        with open(src, "w") as f:
-            f.write(code)
-        compile_proc = await asyncio.create_subprocess_exec(
-            "g++",
-            src,
-            "-o",
-            exe,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        cout, cerr = await compile_proc.communicate()
-        if compile_proc.returncode != 0:
-            return {"stdout": cout.decode(), "stderr": cerr.decode(), "returncode": compile_proc.returncode}
-        run_proc = await asyncio.create_subprocess_exec(
-            exe,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        try:
-            stdout, stderr = await asyncio.wait_for(run_proc.communicate(stdin.encode()), timeout=5)
-        except asyncio.TimeoutError:
-            run_proc.kill()
-            return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
-        return {"stdout": stdout.decode(), "stderr": stderr.decode(), "returncode": run_proc.returncode}
-
-
-async def _run_java(code: str, stdin: str = "") -> dict:
-    with tempfile.TemporaryDirectory() as tmpdir:
-        src = os.path.join(tmpdir, "Main.java")
-        with open(src, "w") as f:
-            f.write(code)
-        compile_proc = await asyncio.create_subprocess_exec(
-            "javac",
-            src,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        cout, cerr = await compile_proc.communicate()
-        if compile_proc.returncode != 0:
-            return {"stdout": cout.decode(), "stderr": cerr.decode(), "returncode": compile_proc.returncode}
-        run_proc = await asyncio.create_subprocess_exec(
-            "java",
-            "-cp",
-            tmpdir,
-            "Main",
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+async def run_code(language: str, code: str, stdin: str = "", profile_top: int = 0) -> dict:
+    """Dispatch execution to a remote runner when configured, else run locally."""
+    if RUNNERS is not None:
+        return await RUNNERS.run(language, code, stdin, profile_top)
+    return await executor.run_code(language, code, stdin, profile_top)
+
+
+async def run_series(language: str, code: str, inputs: list[str]) -> dict | list[dict]:
+    """Build once and run measured on each input, remotely when configured."""
+    if RUNNERS is not None:
+        return await RUNNERS.run_series(language, code, inputs)
+    return await executor.run_series(language, code, inputs)
+
+
+def _scale_sample(sample: str, sizes: list[int]) -> tuple[list[tuple[int, str]], str]:
+    """Scale ``sample`` to each size plus a size-1 baseline, within the element budget."""
+    total = sum(complexity.scaled_size(sample, n) for n in sizes)
+    if total > MAX_PROFILE_ELEMENTS:
+        raise ValueError(f"scaled inputs would hold {total} elements; the limit is {MAX_PROFILE_ELEMENTS}")
+    return [(n, complexity.scale_input(sample, n)) for n in sizes], complexity.scale_input(sample, 1)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    """Report invalid /complexity bodies as 400 like its other input errors."""
+    if request.url.path != "/complexity":
+        return await request_validation_exception_handler(request, exc)
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"][1:])
+    return JSONResponse(status_code=400, content={"error": f"{field}: {error['msg']}"})
+
+
+@app.post("/complexity")
+async def profile_complexity(req: ComplexityRequest):
+    """Run a submission on growing inputs and estimate its time complexity."""
+    code = _decode_code(req)
+    if isinstance(code, JSONResponse):
+        return code
+    sample_input, _ = parse_sample_test_case(req.sampleCase or "")
+    if req.inputs:
+        sizes = [i.size for i in req.inputs]
+    elif sample_input:
+        sizes = list(req.sizes or complexity.DEFAULT_SIZES)
+    else:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "inputs or a sampleCase with an Input line must be provided"},
         )
-        try:
-            stdout, stderr = await asyncio.wait_for(run_proc.communicate(stdin.encode()), timeout=5)
-        except asyncio.TimeoutError:
-            run_proc.kill()
-            return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
-        return {"stdout": stdout.decode(), "stderr": stderr.decode(), "returncode": run_proc.returncode}
-
-
-async def _run_go(code: str, stdin: str = "") -> dict:
-    with tempfile.NamedTemporaryFile("w+", suffix=".go", delete=False) as tmp:
-        tmp.write(code)
-        tmp.flush()
-        proc = await asyncio.create_subprocess_exec(
-            "go",
-            "run",
-            tmp.name,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+    if len(sizes) > MAX_PROFILE_RUNS or any(n > MAX_PROFILE_SIZE for n in sizes):
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"at most {MAX_PROFILE_RUNS} inputs of size <= {MAX_PROFILE_SIZE}"},
         )
+    if req.inputs:
+        sized = [(i.size, i.input) for i in req.inputs]
+        # Nothing to scale down, so start-up is measured on an empty input.
+        baseline = ""
+    else:
         try:
-            stdout, stderr = await asyncio.wait_for(proc.communicate(stdin.encode()), timeout=15)
-        except asyncio.TimeoutError:
-            proc.kill()
-            return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
-    os.unlink(tmp.name)
+            sized, baseline = await asyncio.to_thread(_scale_sample, sample_input, sizes)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+    sized.sort()
+    results = await run_series(req.language, code, [baseline] + [text for _, text in sized])
+    if isinstance(results, dict):
+        return results
+    first = results.pop(0)
+    if "time_ms" not in first:
+        # Timing out on the smallest input is the clearest time-limit failure.
+        return {
+            "baseline_ms": None,
+            "timed_out": True,
+            "points": [],
+            "complexity": None,
+            "residuals": {},
+        }
+    baseline_ms = first["time_ms"]
+    points = []
+    for (n, _), result in zip(sized, results):
+        point = {
+            "size": n,
+            "returncode": result["returncode"],
+            "timed_out": "time_ms" not in result,
+        }
+        if "time_ms" in result:
+            point["time_ms"] = round(max(result["time_ms"] - baseline_ms, 0.0), 3)
+            point["cpu_ms"] = round(result["cpu_ms"], 3)
+            point["memory_kb"] = result["memory_kb"]
+        if result["returncode"] != 0:
+            point["stderr"] = result["stderr"]
+        points.append(point)
+    ok = [(p["size"], p["time_ms"]) for p in points if p["returncode"] == 0 and not p["timed_out"]]
+    growth, residuals = complexity.fit_growth(ok)
     return {
-        "stdout": stdout.decode(),
-        "stderr": stderr.decode(),
-        "returncode": proc.returncode,
+        "baseline_ms": round(baseline_ms, 3),
+        "timed_out": any(p["timed_out"] for p in points),
+        "points": points,
+        "complexity": growth,
+        "residuals": residuals,
     }
 
 
-async def run_code(language: str, code: str, stdin: str = "") -> dict:
-    """Dispatch execution to the correct runtime based on language."""
-    lang = language.lower()
-    if lang == "python":
-        return await _run_python(code, stdin)
-    if lang in {"cpp", "c++"}:
-        return await _run_cpp(code, stdin)
-    if lang == "java":
-        return await _run_java(code, stdin)
-    if lang == "go":
-        return await _run_go(code, stdin)
-    return {"stdout": "", "stderr": "Unsupported language", "returncode": 1}
-
-
-mcp_server = FastApiMCP(app)
-mcp_server.mount()
+async def mount_mcp() -> None:
+    """Import fastapi_mcp off the event loop and mount the MCP server once."""
+    global mcp_server
+    if mcp_server is not None:
+        return
+    fastapi_mcp = await asyncio.to_thread(importlib.import_module, "fastapi_mcp")
+    if mcp_server is None:
+        mcp_server = fastapi_mcp.FastApiMCP(app)
+        mcp_server.mount()
@@ -0,0 +1,100 @@
+"""Cold-start benchmark: import time and time to first response.
+
+Run from anywhere; exits non-zero when a budget is exceeded so it can gate CI
+(``tests/test_startup.py`` runs it with the default budgets)::
+
+    python benchmarks/startup.py --import-budget-ms 1500 --ttfr-budget-ms 3000
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = 1500
+TTFR_BUDGET_MS = 3000
+
+_IMPORT = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+
+
+def measure_import(runs: int) -> float:
+    """Median wall time in milliseconds to ``import app`` in a fresh interpreter."""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT], cwd=ROOT, check=True, capture_output=True, text=True
+        )
+        samples.append(float(out.stdout) * 1000)
+    return statistics.median(samples)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_first_response(runs: int, path: str = "/metrics/loop-lag", timeout: float = 30.0) -> float:
+    """Median milliseconds from launching uvicorn to the first 200 on ``path``.
+
+    The default path is answered in-process, so upstream LeetCode latency does
+    not leak into the measurement.
+    """
+    samples = []
+    for _ in range(runs):
+        port = _free_port()
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port)],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError("server did not respond in time")
+                try:
+                    if httpx.get(f"http://127.0.0.1:{port}{path}", timeout=1).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    time.sleep(0.01)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            proc.terminate()
+            proc.wait()
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--ttfr-budget-ms", type=float, default=TTFR_BUDGET_MS)
+    args = parser.parse_args()
+
+    result = {
+        "import_ms": round(measure_import(args.runs), 1),
+        "first_response_ms": round(measure_first_response(args.runs), 1),
+    }
+    print(json.dumps(result))
+    over = []
+    if result["import_ms"] > args.import_budget_ms:
+        over.append(f"import {result['import_ms']} ms > {args.import_budget_ms} ms")
+    if result["first_response_ms"] > args.ttfr_budget_ms:
+        over.append(f"first response {result['first_response_ms']} ms > {args.ttfr_budget_ms} ms")
+    for line in over:
+        print(f"budget exceeded: {line}", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Empirical time-complexity estimation for submissions.
+
+``scale_input`` grows a LeetCode-style sample input such as
+``nums = [2,7,11,15], target = 9`` to a requested size, and ``fit_growth``
+picks the growth class that best explains the measured run times.
+"""
+
+import json
+import math
+import random
+import re
+import string
+from typing import Iterator, Optional
+
+DEFAULT_SIZES = (1000, 2000, 4000, 8000, 16000, 32000)
+
+# Growth classes tried by ``fit_growth`` in order of increasing cost.
+GROWTH_CLASSES = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n^2)": lambda n: float(n) ** 2,
+    "O(n^3)": lambda n: float(n) ** 3,
+}
+
+# Runs faster than this are dominated by timer and scheduling noise.
+NOISE_FLOOR_MS = 1.0
+
+
+def _scale_value(value, n: int, rng: random.Random):
+    if isinstance(value, str):
+        alphabet = "".join(sorted(set(value))) or string.ascii_lowercase
+        return "".join(rng.choice(alphabet) for _ in range(n))
+    if not isinstance(value, list):
+        return value
+    if value and all(isinstance(v, list) for v in value):
+        return [_scale_value(value[i % len(value)], len(value[i % len(value)]), rng) for i in range(n)]
+    if value and all(isinstance(v, str) for v in value):
+        width = max(len(v) for v in value)
+        return [_scale_value(value[i % len(value)], width, rng) for i in range(n)]
+    numbers = [v for v in value if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if numbers:
+        lo, hi = min(numbers), max(numbers)
+        if lo == hi:
+            lo, hi = min(lo, 0), max(hi, n)
+        if all(isinstance(v, int) for v in numbers):
+            return [rng.randint(int(lo), int(hi)) for _ in range(n)]
+        return [rng.uniform(lo, hi) for _ in range(n)]
+    return [rng.randint(0, n) for _ in range(n)]
+
+
+def _literal_end(text: str, start: int) -> Optional[int]:
+    """Return the index just past the list or string literal at ``start``."""
+    depth = 0
+    in_str = False
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if in_str:
+            if ch == "\\":
+                i += 1
+            elif ch == '"':
+                in_str = False
+                if depth == 0:
+                    return i + 1
+        elif ch == '"':
+            in_str = True
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return None
+
+
+def _literals(sample: str) -> Iterator[tuple[int, int, object]]:
+    """Yield ``(start, end, value)`` for each JSON list or string literal in ``sample``."""
+    pos = 0
+    for match in re.finditer(r'[\["]', sample):
+        if match.start() < pos:
+            continue
+        end = _literal_end(sample, match.start())
+        if end is None:
+            return
+        try:
+            value = json.loads(sample[match.start():end])
+        except ValueError:
+            continue
+        yield match.start(), end, value
+        pos = end
+
+
+def _scaled_size(value, n: int) -> int:
+    n = max(n, 0)
+    if isinstance(value, str):
+        return n
+    if not isinstance(value, list):
+        return 0
+    if value and all(isinstance(v, list) for v in value):
+        rows = [_scaled_size(v, len(v)) for v in value]
+        full, rest = divmod(n, len(rows))
+        return n + full * sum(rows) + sum(rows[:rest])
+    if value and all(isinstance(v, str) for v in value):
+        return n * max(len(v) for v in value)
+    return n
+
+
+def scaled_size(sample: str, n: int) -> int:
+    """Return how many elements ``scale_input(sample, n)`` would generate.
+
+    Rows of nested lists and characters of strings are counted, so the result
+    bounds the work and memory of scaling before any of it is done.
+    """
+    return sum(_scaled_size(value, n) for _, _, value in _literals(sample))
+
+
+def scale_input(sample: str, n: int, seed: int = 0) -> str:
+    """Return ``sample`` with every list and string literal grown to length ``n``.
+
+    Nested lists keep the inner length of the sample rows.  When the sample has
+    no list or string literal, every integer in it is replaced by ``n``.
+    """
+    rng = random.Random(seed)
+    parts = []
+    pos = 0
+    for start, end, value in _literals(sample):
+        parts.append(sample[pos:start])
+        parts.append(json.dumps(_scale_value(value, n, rng), separators=(",", ":")))
+        pos = end
+    if not parts:
+        return re.sub(r"-?\d+", str(n), sample)
+    parts.append(sample[pos:])
+    return "".join(parts)
+
+
+def fit_growth(points: list[tuple[int, float]]) -> tuple[Optional[str], dict[str, float]]:
+    """Pick the growth class that best fits ``(size, time_ms)`` points.
+
+    Each class is fitted as ``time = c * f(n)`` in log space; the residual is
+    the mean squared log error.  Returns the best class and all residuals, or
+    ``None`` when fewer than two points are available.
+    """
+    pts = [(n, max(t, NOISE_FLOOR_MS)) for n, t in points if n > 1]
+    if len(pts) < 2:
+        return None, {}
+    if all(t <= NOISE_FLOOR_MS for _, t in pts):
+        return "O(1)", {"O(1)": 0.0}
+    residuals = {}
+    for name, f in GROWTH_CLASSES.items():
+        logs = [math.log(t) - math.log(f(n)) for n, t in pts]
+        log_c = sum(logs) / len(logs)
+        residuals[name] = round(sum((v - log_c) ** 2 for v in logs) / len(logs), 6)
+    best = min(residuals, key=residuals.get)
+    return best, residuals
@@ -0,0 +1,187 @@
+"""Client side of the remote runner protocol.
+
+Runners are ``runner.py`` processes exposing::
+
+    GET  /health  -> {"languages": [...], "active": n, "capacity": n, "served": n}
+    POST /run     {"language", "code", "stdin", "profileTop"} -> {"stdout", "stderr", "returncode"}
+    POST /series  {"language", "code", "inputs"} -> [measured result, ...] | result
+
+``RunnerPool`` sends each execution to the least-loaded runner that supports
+the language.  Load is the ``active`` count the runner reports, refreshed about
+once a second so that dispatchers in other processes are accounted for, plus
+this process's runs started since that report.  A runner at capacity answers
+503 and the request moves on to the next candidate; one that cannot be
+reached or fails its health check is taken out of rotation for a cool-down
+period.  Any other error status is returned as a failed run, not retried.
+
+Responses are awaited for as long as the runner itself may take
+(``executor.max_duration``) plus ``slack``; a run that outlasts that is
+reported as timed out rather than retried, since the runner already accepted
+it.
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+import httpx
+
+import executor
+
+
+class Runner:
+    """One remote runner addressed by ``http://host:port`` or ``unix:///path``."""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        if spec.startswith("unix://"):
+            self.uds: Optional[str] = spec[len("unix://"):]
+            self.base_url = "http://runner"
+        else:
+            self.uds = None
+            self.base_url = spec.rstrip("/")
+        self.languages: Optional[set[str]] = None
+        self.capacity = 1
+        self.active = 0
+        self.inflight = 0
+        self.inflight_at_check = 0
+        self.checked_at = 0.0
+        self.down_until = 0.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def client(self) -> httpx.AsyncClient:
+        """Return this runner's keep-alive client, created on first use.
+
+        Connections belong to the event loop that opened them, so a client
+        made under another loop is replaced rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            transport = httpx.AsyncHTTPTransport(uds=self.uds) if self.uds else None
+            self._client = httpx.AsyncClient(base_url=self.base_url, transport=transport)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._client_loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    @property
+    def load(self) -> float:
+        started = max(self.inflight - self.inflight_at_check, 0)
+        return (self.active + started) / max(self.capacity, 1)
+
+
+class RunnerPool:
+    """Load-balancing, retrying dispatcher over a fixed set of runners."""
+
+    def __init__(
+        self,
+        specs: list[str],
+        health_ttl: float = 1.0,
+        cooldown: float = 5.0,
+        slack: float = 10.0,
+        busy_retries: int = 3,
+        busy_backoff: float = 0.1,
+    ):
+        self.runners = [Runner(spec) for spec in specs]
+        self.health_ttl = health_ttl
+        self.cooldown = cooldown
+        self.slack = slack
+        self.busy_retries = busy_retries
+        self.busy_backoff = busy_backoff
+
+    @classmethod
+    def from_env(cls, value: Optional[str]) -> Optional["RunnerPool"]:
+        """Build a pool from a comma-separated list of runner addresses."""
+        specs = [s.strip() for s in (value or "").split(",") if s.strip()]
+        return cls(specs) if specs else None
+
+    async def aclose(self) -> None:
+        """Close the connections held to every runner."""
+        await asyncio.gather(*(r.aclose() for r in self.runners))
+
+    def _mark_down(self, runner: Runner) -> None:
+        runner.down_until = time.monotonic() + self.cooldown
+        runner.languages = None
+
+    async def _refresh(self, runner: Runner) -> None:
+        now = time.monotonic()
+        if runner.languages is not None and now - runner.checked_at < self.health_ttl:
+            return
+        try:
+            resp = await runner.client().get("/health", timeout=5.0)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError):
+            self._mark_down(runner)
+            return
+        runner.languages = set(data.get("languages", []))
+        runner.capacity = data.get("capacity", 1)
+        runner.active = data.get("active", 0)
+        runner.inflight_at_check = runner.inflight
+        runner.checked_at = now
+
+    async def _candidates(self, language: str) -> list[Runner]:
+        now = time.monotonic()
+        up = [r for r in self.runners if r.down_until <= now]
+        await asyncio.gather(*(self._refresh(r) for r in up))
+        able = [r for r in up if r.languages and language in r.languages]
+        random.shuffle(able)
+        return sorted(able, key=lambda r: r.load)
+
+    async def _post(self, language: str, path: str, payload: dict, duration: float):
+        busy = False
+        for attempt in range(self.busy_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.busy_backoff * 2 ** (attempt - 1))
+            busy = False
+            for runner in await self._candidates(language):
+                runner.inflight += 1
+                try:
+                    timeout = httpx.Timeout(duration + self.slack, connect=5.0)
+                    resp = await runner.client().post(path, json=payload, timeout=timeout)
+                    resp.raise_for_status()
+                    return resp.json()
+                except httpx.HTTPStatusError as e:
+                    status = e.response.status_code
+                    if status != 503:
+                        # The runner is up and answered; the request itself
+                        # failed and would fail the same way on any runner.
+                        return {"stdout": "", "stderr": f"Runner error: HTTP {status}", "returncode": 1}
+                    # Full, not broken: treat as saturated until the next report.
+                    runner.active = runner.capacity
+                    busy = True
+                except httpx.ReadTimeout:
+                    # The runner accepted the run and may still be executing
+                    # it; running it again elsewhere would double the work.
+                    return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
+                except (httpx.HTTPError, ValueError):
+                    self._mark_down(runner)
+                finally:
+                    runner.inflight -= 1
+            if not busy:
+                break
+        if busy:
+            return {"stdout": "", "stderr": "All runners are busy", "returncode": 1}
+        return {"stdout": "", "stderr": f"No runner available for {language}", "returncode": 1}
+
+    async def run(self, language: str, code: str, stdin: str = "", profile_top: int = 0) -> dict:
+        """Execute ``code`` on a capable runner, retrying elsewhere on failure or 503."""
+        lang = executor.normalize_language(language)
+        if lang not in executor.LANGUAGES:
+            return executor.unsupported()
+        payload = {"language": lang, "code": code, "stdin": stdin, "profileTop": profile_top}
+        duration = executor.max_duration(lang, profile=bool(profile_top) and lang == "python")
+        return await self._post(lang, "/run", payload, duration)
+
+    async def run_series(self, language: str, code: str, inputs: list[str]) -> dict | list[dict]:
+        """Remote counterpart of ``executor.run_series``."""
+        lang = executor.normalize_language(language)
+        if lang not in executor.LANGUAGES:
+            return executor.unsupported()
+        payload = {"language": lang, "code": code, "inputs": inputs}
+        return await self._post(lang, "/series", payload, executor.max_duration(lang, len(inputs)))
@@ -0,0 +1,270 @@
+"""Local compilation and execution of submitted code."""
+
+import asyncio
+import json
+import os
+import shutil
+import signal
+import sys
+from typing import Optional
+
+from workspace import WorkspacePool, usage
+
+LANGUAGES = ("python", "cpp", "java", "go")
+
+# Toolchain binaries each language needs on PATH besides the interpreter.
+TOOLCHAINS = {"python": (), "cpp": ("g++",), "java": ("javac", "java"), "go": ("go",)}
+
+# Per-run sandbox directories, on /dev/shm by default so that source writes,
+# compiler output and cleanup stay off the disk.
+WORKSPACES = WorkspacePool(
+    root=os.environ.get("CODE_TRAINER_WORKSPACE_ROOT"),
+    size=int(os.environ.get("CODE_TRAINER_WORKSPACES", "8")),
+    max_bytes=int(os.environ.get("CODE_TRAINER_WORKSPACE_MAX_BYTES", str(64 * 1024 * 1024))),
+    overflow=int(os.environ.get("CODE_TRAINER_WORKSPACE_OVERFLOW", "0")),
+)
+
+
+def normalize_language(language: str) -> str:
+    """Map user-facing language names onto the canonical ``LANGUAGES`` keys."""
+    lang = language.lower()
+    return "cpp" if lang == "c++" else lang
+
+
+def available_languages() -> list[str]:
+    """Return the languages whose toolchains are installed on this host."""
+    return [
+        lang for lang in LANGUAGES
+        if all(shutil.which(tool) for tool in TOOLCHAINS[lang])
+    ]
+
+
+def unsupported() -> dict:
+    return {"stdout": "", "stderr": "Unsupported language", "returncode": 1}
+
+
+# Submitted text may hold lone surrogates (valid JSON, invalid UTF-8).  They are
+# passed through as raw bytes for the compiler or program to reject, and any
+# undecodable output is replaced, so a bad payload fails the run, not the server.
+_ENCODING_ERRORS = "surrogatepass"
+
+
+def _write_source(path: str, code: str) -> None:
+    with open(path, "w", encoding="utf-8", errors=_ENCODING_ERRORS) as f:
+        f.write(code)
+
+
+# Launched in front of a measured command: waits for it with wait4 and writes
+# its wall time, CPU time and peak RSS to the file given as first argument.
+# ru_maxrss would include the launcher's own memory inherited across exec, so
+# the peak is sampled from the program's VmHWM while it runs instead.
+_MEASURE = """
+import json, os, sys, threading, time
+peak = [None]
+def sample(path):
+    while not done.is_set():
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        peak[0] = max(peak[0] or 0, int(line.split()[1]))
+        except (OSError, ValueError):
+            pass
+        done.wait(0.005)
+done = threading.Event()
+start = time.perf_counter()
+pid = os.posix_spawnp(sys.argv[2], sys.argv[2:], os.environ)
+threading.Thread(target=sample, args=(f"/proc/{pid}/status",), daemon=True).start()
+_, status, usage = os.wait4(pid, 0)
+wall = time.perf_counter() - start
+done.set()
+with open(sys.argv[1], "w") as f:
+    json.dump({"time_ms": wall * 1000, "cpu_ms": (usage.ru_utime + usage.ru_stime) * 1000,
+               "memory_kb": peak[0]}, f)
+sys.exit(os.waitstatus_to_exitcode(status))
+"""
+
+
+def _read_stats(path: str) -> dict:
+    """Load a JSON report written by a helper process, or ``{}`` if it is missing."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _kill_group(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def _exec(
+    *cmd: str,
+    stdin: str = "",
+    timeout: Optional[float] = None,
+    workspace: Optional[str] = None,
+    measure: bool = False,
+) -> dict:
+    """Run ``cmd`` feeding ``stdin`` and collect its output within ``timeout``.
+
+    With ``workspace`` the process runs inside it, keeps its temp files there
+    and is killed if the workspace grows past the pool's size budget.
+    ``measure`` additionally reports ``time_ms``, ``cpu_ms`` and ``memory_kb``
+    of the command.
+    """
+    kwargs = {}
+    stats_path = None
+    if measure:
+        stats_path = os.path.join(workspace or ".", ".measure.json")
+        cmd = (sys.executable, "-c", _MEASURE, stats_path, *cmd)
+    if workspace is not None:
+        cmd, kwargs = WORKSPACES.limited(cmd)
+        kwargs.update(cwd=workspace, env={**os.environ, "TMPDIR": workspace})
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+        **kwargs,
+    )
+    watchdog = None
+    if workspace is not None:
+        watchdog = asyncio.create_task(WORKSPACES.enforce(proc.pid, workspace))
+    timed_out = False
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(stdin.encode("utf-8", _ENCODING_ERRORS)), timeout=timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        # Also reaps children that closed their stdio and outlived the program,
+        # so nothing keeps writing once the workspace goes back to the pool.
+        _kill_group(proc.pid)
+        exceeded = watchdog is not None and watchdog.done() and not watchdog.cancelled()
+        if watchdog is not None:
+            watchdog.cancel()
+    if timed_out:
+        await proc.wait()
+        return {"stdout": "", "stderr": "Execution timed out", "returncode": 1}
+    if watchdog is not None and not exceeded:
+        exceeded = await asyncio.to_thread(usage, workspace) > WORKSPACES.max_bytes
+    if exceeded:
+        return {"stdout": stdout.decode(errors="replace"), "stderr": "Workspace size limit exceeded", "returncode": 1}
+    result = {
+        "stdout": stdout.decode(errors="replace"),
+        "stderr": stderr.decode(errors="replace"),
+        "returncode": proc.returncode,
+    }
+    if stats_path is not None:
+        result.update(await asyncio.to_thread(_read_stats, stats_path))
+    return result
+
+
+async def _build_python(code: str, ws: str) -> list[str] | dict:
+    src = os.path.join(ws, "main.py")
+    await asyncio.to_thread(_write_source, src, code)
+    return [sys.executable, src]
+
+
+async def _build_cpp(code: str, ws: str) -> list[str] | dict:
+    src = os.path.join(ws, "main.cpp")
+    exe = os.path.join(ws, "main")
+    await asyncio.to_thread(_write_source, src, code)
+    compiled = await _exec("g++", src, "-o", exe, timeout=BUILD_TIMEOUT, workspace=ws)
+    if compiled["returncode"] != 0:
+        return compiled
+    return [exe]
+
+
+async def _build_java(code: str, ws: str) -> list[str] | dict:
+    src = os.path.join(ws, "Main.java")
+    await asyncio.to_thread(_write_source, src, code)
+    compiled = await _exec("javac", src, timeout=BUILD_TIMEOUT, workspace=ws)
+    if compiled["returncode"] != 0:
+        return compiled
+    return ["java", "-cp", ws, "Main"]
+
+
+async def _build_go(code: str, ws: str) -> list[str] | dict:
+    src = os.path.join(ws, "main.go")
+    exe = os.path.join(ws, "main")
+    await asyncio.to_thread(_write_source, src, code)
+    compiled = await _exec("go", "build", "-o", exe, src, timeout=BUILD_TIMEOUT, workspace=ws)
+    if compiled["returncode"] != 0:
+        return compiled
+    return [exe]
+
+
+# Per language: writes the source into a workspace and compiles it, returning
+# the command that runs the program or the failed compiler result.
+BUILDERS = {"python": _build_python, "cpp": _build_cpp, "java": _build_java, "go": _build_go}
+
+# Wall-clock limit in seconds for a single run of the built program.
+TIMEOUTS = {"python": 15, "cpp": 5, "java": 5, "go": 15}
+
+# Wall-clock limit in seconds for compiling a submission.
+BUILD_TIMEOUT = 60
+
+
+# Profiled Python runs go through this harness; plain runs never load it.
+HOTSPOTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotspots.py")
+
+# Profiled runs are slower, so they get this multiple of the normal timeout.
+PROFILE_TIMEOUT_FACTOR = 3
+
+
+def max_duration(language: str, runs: int = 1, profile: bool = False) -> float:
+    """Longest ``run_code`` (``runs=1``) or ``run_series`` call can take, in seconds."""
+    lang = normalize_language(language)
+    per_run = TIMEOUTS[lang] * (PROFILE_TIMEOUT_FACTOR if profile else 1)
+    return BUILD_TIMEOUT + runs * per_run
+
+
+async def run_code(language: str, code: str, stdin: str = "", profile_top: int = 0) -> dict:
+    """Dispatch execution to the correct runtime based on language.
+
+    With ``profile_top`` a Python run is executed under ``hotspots.py`` and the
+    top functions, lines and allocations are returned under ``profile``.
+    """
+    lang = normalize_language(language)
+    if lang not in BUILDERS:
+        return unsupported()
+    async with WORKSPACES.acquire() as ws:
+        built = await BUILDERS[lang](code, ws)
+        if isinstance(built, dict):
+            return built
+        if not (profile_top and lang == "python"):
+            return await _exec(*built, stdin=stdin, timeout=TIMEOUTS[lang], workspace=ws)
+        out = os.path.join(ws, ".profile.json")
+        result = await _exec(
+            sys.executable, HOTSPOTS, out, built[-1], str(profile_top),
+            stdin=stdin, timeout=TIMEOUTS[lang] * PROFILE_TIMEOUT_FACTOR, workspace=ws,
+        )
+        result["profile"] = await asyncio.to_thread(_read_stats, out) or None
+        return result
+
+
+async def run_series(language: str, code: str, inputs: list[str]) -> dict | list[dict]:
+    """Build ``code`` once and run it, measured, on each of ``inputs``.
+
+    Returns the failed build result, or one measured result per input.  The
+    series stops after the first timeout since larger inputs would also time
+    out.
+    """
+    lang = normalize_language(language)
+    if lang not in BUILDERS:
+        return unsupported()
+    results = []
+    async with WORKSPACES.acquire() as ws:
+        built = await BUILDERS[lang](code, ws)
+        if isinstance(built, dict):
+            return built
+        for stdin in inputs:
+            result = await _exec(*built, stdin=stdin, timeout=TIMEOUTS[lang], workspace=ws, measure=True)
+            results.append(result)
+            if "time_ms" not in result:
+                break
+    return results
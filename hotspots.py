@@ -0,0 +1,150 @@
+"""Profiling harness for Python submissions.
+
+Only profiled runs go through this script; ordinary runs execute the
+submission directly, so they carry none of the overhead::
+
+    python hotspots.py OUT.json main.py TOP_N
+
+The submission runs as ``__main__`` under three collectors whose results are
+written to ``OUT.json``:
+
+* ``cProfile`` for per-function call counts and cumulative time,
+* a ``SIGPROF`` sampler for per-line cumulative time in the submission,
+  scaled by each line's share of the samples to the run's CPU time,
+* ``tracemalloc`` for the allocation peak and the lines holding most memory
+  near that peak.
+"""
+
+import cProfile
+import collections
+import json
+import linecache
+import os
+import pstats
+import runpy
+import signal
+import sys
+import time
+import traceback
+import tracemalloc
+
+SAMPLE_INTERVAL = 0.001
+
+# A new allocation snapshot is taken whenever traced memory grows by this
+# factor, so the reported lines reflect the heap near its peak.
+PEAK_GROWTH = 1.25
+
+# Frames belonging to this harness rather than to the submission.
+HARNESS_FILES = {__file__, runpy.__file__, "<frozen runpy>"}
+HARNESS_FUNCTIONS = {
+    "<built-in method builtins.exec>",
+    "<method 'disable' of '_lsprof.Profiler' objects>",
+}
+
+
+def _function_stats(prof: cProfile.Profile, script: str, top: int) -> list[dict]:
+    rows = []
+    for (filename, line, func), (_, calls, tt, ct, _) in pstats.Stats(prof).stats.items():
+        if filename in HARNESS_FILES or func in HARNESS_FUNCTIONS:
+            continue
+        rows.append({
+            "function": func,
+            "file": "main.py" if filename == script else filename,
+            "line": line,
+            "calls": calls,
+            "total_ms": round(tt * 1000, 3),
+            "cumulative_ms": round(ct * 1000, 3),
+        })
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def main() -> int:
+    out, script, top = sys.argv[1], os.path.abspath(sys.argv[2]), int(sys.argv[3])
+    sys.argv = [script]
+    samples = collections.Counter()
+    ticks = [0]
+    peak_snapshot = [None, 0]
+    busy = [False]
+
+    def capture_peak() -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > peak_snapshot[1] * PEAK_GROWTH:
+            peak_snapshot[:] = [tracemalloc.take_snapshot(), current]
+
+    def on_sample(signum, frame):
+        # Snapshots are slow; ignore ticks that land while one is being taken.
+        if busy[0]:
+            return
+        busy[0] = True
+        ticks[0] += 1
+        seen = set()
+        while frame is not None:
+            if frame.f_code.co_filename == script:
+                seen.add(frame.f_lineno)
+            frame = frame.f_back
+        samples.update(seen)
+        capture_peak()
+        busy[0] = False
+
+    signal.signal(signal.SIGPROF, on_sample)
+    tracemalloc.start()
+    prof = cProfile.Profile()
+    status = 0
+    cpu_start = time.process_time()
+    signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+    module_globals = None
+    try:
+        # Keep the module's globals referenced until the final snapshot below.
+        module_globals = prof.runcall(runpy.run_path, script, run_name="__main__")
+    except SystemExit as e:
+        # Mirror the interpreter: other exit codes are printed and exit with 1.
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        cpu_ms = (time.process_time() - cpu_start) * 1000
+        capture_peak()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = peak_snapshot[0]
+        tracemalloc.stop()
+        del module_globals
+    sys.stdout.flush()
+
+    allocations = [
+        {
+            "line": stat.traceback[0].lineno,
+            "source": linecache.getline(script, stat.traceback[0].lineno).strip(),
+            "size_kb": round(stat.size / 1024, 3),
+            "count": stat.count,
+        }
+        for stat in snapshot.filter_traces([tracemalloc.Filter(True, script)]).statistics("lineno")[:top]
+        if stat.traceback[0].lineno
+    ]
+    lines = [
+        {
+            "line": line,
+            "source": linecache.getline(script, line).strip(),
+            "samples": n,
+            "cumulative_ms": round(n / ticks[0] * cpu_ms, 3),
+        }
+        for line, n in samples.most_common(top)
+    ]
+    with open(out, "w") as f:
+        json.dump({
+            "cpu_ms": round(cpu_ms, 3),
+            "functions": _function_stats(prof, script, top),
+            "lines": lines,
+            "memory": {"peak_kb": round(peak / 1024, 3), "top": allocations},
+        }, f)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Event-loop lag monitoring.
+
+A background task sleeps for a fixed interval and records how late it wakes
+up.  Anything that blocks the loop (sync I/O, CPU-heavy rendering) shows up
+as lag, so the histogram makes stalls visible under load.
+"""
+
+import asyncio
+import bisect
+import time
+from typing import Optional
+
+# Upper bounds in milliseconds; the last bucket catches everything above.
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LoopLagMonitor:
+    """Histogram of event-loop wake-up delays."""
+
+    def __init__(self, interval: float = 0.1, buckets: tuple[float, ...] = LAG_BUCKETS_MS):
+        self.interval = interval
+        self.buckets = buckets
+        self.reset()
+        self._task: Optional[asyncio.Task] = None
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, lag_ms)] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.observe(max(lag, 0.0) * 1000)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Return the histogram as cumulative ``le`` buckets plus summary stats."""
+        cumulative = 0
+        buckets = []
+        for bound, n in zip([*self.buckets, "+Inf"], self.counts):
+            cumulative += n
+            buckets.append({"le": bound, "count": cumulative})
+        return {
+            "interval_ms": self.interval * 1000,
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
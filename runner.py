@@ -0,0 +1,100 @@
+"""Standalone runner worker serving the ``run_code`` contract over HTTP.
+
+Start one per host (or several per host) and list them in the web app's
+``CODE_TRAINER_RUNNERS`` setting::
+
+    python runner.py --port 9001
+    python runner.py --uds /run/code-trainer/runner.sock
+"""
+
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+import executor
+
+
+class RunRequest(BaseModel):
+    language: str = Field(..., description="python | cpp | java | go")
+    code: str = Field(..., description="Source code to execute")
+    stdin: str = Field("", description="Data fed to the program's standard input")
+    profileTop: int = Field(0, description="Profile a Python run and keep this many hotspots")
+
+
+class SeriesRequest(BaseModel):
+    language: str = Field(..., description="python | cpp | java | go")
+    code: str = Field(..., description="Source code to execute")
+    inputs: list[str] = Field(..., description="Standard input for each measured run")
+
+
+# Maximum concurrent runs; further requests get 503 so the dispatcher can
+# send them to another runner.  Set with --capacity.
+CAPACITY = executor.WORKSPACES.size
+ACTIVE = 0
+SERVED = 0
+
+
+@asynccontextmanager
+async def _slot():
+    global ACTIVE, SERVED
+    if ACTIVE >= CAPACITY:
+        raise HTTPException(503, "Runner at capacity")
+    ACTIVE += 1
+    try:
+        yield
+    finally:
+        ACTIVE -= 1
+        SERVED += 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(executor.WORKSPACES.prewarm)
+    yield
+    await asyncio.to_thread(executor.WORKSPACES.close)
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {
+        "languages": executor.available_languages(),
+        "active": ACTIVE,
+        "capacity": CAPACITY,
+        "served": SERVED,
+    }
+
+
+@app.post("/run")
+async def run(req: RunRequest):
+    async with _slot():
+        return await executor.run_code(req.language, req.code, req.stdin, req.profileTop)
+
+
+@app.post("/series")
+async def series(req: SeriesRequest):
+    async with _slot():
+        return await executor.run_series(req.language, req.code, req.inputs)
+
+
+def main() -> None:
+    global CAPACITY
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run submitted code for the Code Trainer web app.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--uds", help="listen on a unix socket instead of TCP")
+    parser.add_argument("--capacity", type=int, default=CAPACITY, help="maximum concurrent runs")
+    args = parser.parse_args()
+    CAPACITY = args.capacity
+    uvicorn.run(app, host=args.host, port=args.port, uds=args.uds)
+
+
+if __name__ == "__main__":
+    main()
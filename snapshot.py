@@ -0,0 +1,279 @@
+"""Versioned, memory-mapped problem snapshot shared by all workers on a node.
+
+A single refresher process (``python snapshot.py PATH``) fetches the catalog
+and problem details from LeetCode and publishes them into one file.  Every
+uvicorn worker maps that file read-only and decodes only the entry a request
+picks, so the catalog lives once in the OS page cache instead of once per
+process.
+
+File layout::
+
+    header   "<8sQQQ"  magic, version, meta offset, meta length
+    blobs    UTF-8 slugs and JSON documents (one catalog entry and one detail
+             dict per problem)
+    records  RECORD per problem, sorted by slug: entry, detail and slug
+             (offset, length) pairs; a detail length of 0 means no detail
+    tables   "<I" indexes into the records: all of them in catalog order, and
+             one table per lower-cased difficulty
+    meta     UTF-8 JSON {"count": n, "records": off, "order": [off, n],
+                         "difficulties": {"easy": [off, n], ...}}
+
+New versions are written to a temporary file in the same directory and moved
+into place with ``os.replace`` so readers never observe a partial snapshot.
+"""
+
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import random
+import struct
+import tempfile
+import time
+from typing import Optional
+
+MAGIC = b"CTSNAP2\0"
+HEADER = struct.Struct("<8sQQQ")
+RECORD = struct.Struct("<QIQIQI")
+INDEX = struct.Struct("<I")
+
+
+def slug_of(problem: dict) -> str:
+    """Return the LeetCode title slug for a catalog entry."""
+    return problem.get("url", "").rstrip("/").split("/")[-1]
+
+
+def write_snapshot(path: str, catalog: list[dict], details: dict[str, dict], version: int) -> None:
+    """Atomically publish ``catalog`` and ``details`` as snapshot ``version``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            offset = HEADER.size
+
+            def put(blob: bytes) -> tuple[int, int]:
+                nonlocal offset
+                f.write(blob)
+                loc = (offset, len(blob))
+                offset += len(blob)
+                return loc
+
+            def put_json(obj) -> tuple[int, int]:
+                return put(json.dumps(obj, separators=(",", ":")).encode())
+
+            rows = []
+            for position, entry in enumerate(catalog):
+                slug = slug_of(entry)
+                detail = details.get(slug)
+                rows.append((
+                    slug.encode(),
+                    position,
+                    str(entry.get("difficulty", "")).lower(),
+                    put_json(entry),
+                    put_json(detail) if detail is not None else (0, 0),
+                ))
+            rows.sort(key=lambda row: row[0])
+            slug_locs = [put(row[0]) for row in rows]
+            records_off, _ = put(b"".join(
+                RECORD.pack(*row[3], *row[4], *slug_loc) for row, slug_loc in zip(rows, slug_locs)
+            ))
+
+            def put_table(indexes: list[int]) -> list[int]:
+                return [put(b"".join(INDEX.pack(i) for i in indexes))[0], len(indexes)]
+
+            order = [0] * len(rows)
+            by_difficulty: dict[str, list[int]] = {}
+            for i, (_, position, difficulty, _, _) in enumerate(rows):
+                order[position] = i
+                by_difficulty.setdefault(difficulty, []).append(i)
+            meta_off, meta_len = put_json({
+                "count": len(rows),
+                "records": records_off,
+                "order": put_table(order),
+                "difficulties": {name: put_table(indexes) for name, indexes in by_difficulty.items()},
+            })
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, version, meta_off, meta_len))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class _Mapped:
+    """One published version: the mapping and its decoded meta block."""
+
+    def __init__(self, mm: mmap.mmap, meta: dict):
+        self.mm = mm
+        self.meta = meta
+
+    def record(self, i: int) -> tuple[int, ...]:
+        return RECORD.unpack_from(self.mm, self.meta["records"] + i * RECORD.size)
+
+    def table(self, loc: list[int]) -> list[int]:
+        off, count = loc
+        return [i for (i,) in INDEX.iter_unpack(self.mm[off:off + count * INDEX.size])]
+
+    def pick(self, difficulty: str) -> Optional[int]:
+        off, count = self.meta["difficulties"].get(difficulty, (0, 0))
+        if not count:
+            return None
+        return INDEX.unpack_from(self.mm, off + random.randrange(count) * INDEX.size)[0]
+
+    def slug(self, record: tuple[int, ...]) -> str:
+        return self.mm[record[4]:record[4] + record[5]].decode()
+
+    def find(self, slug: str) -> Optional[tuple[int, ...]]:
+        key = slug.encode()
+        lo, hi = 0, self.meta["count"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self.record(mid)
+            found = self.mm[record[4]:record[4] + record[5]]
+            if found == key:
+                return record
+            if found < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def load(self, off: int, length: int):
+        return json.loads(self.mm[off:off + length])
+
+
+class SnapshotReader:
+    """Read-only view of the snapshot at ``path`` that follows atomic swaps.
+
+    Accessors read the currently mapped version and decode only what they
+    return; ``reload`` (or ``poll`` from the event loop) maps a newly
+    published version.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.version: Optional[int] = None
+        self._view: Optional[_Mapped] = None
+        self._file_id: Optional[tuple[int, int]] = None
+        self._next_check = 0.0
+
+    def reload(self) -> None:
+        """Map the file again if a new version was published since the last check."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        file_id = (st.st_ino, st.st_mtime_ns)
+        if file_id == self._file_id:
+            return
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_off, meta_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            return
+        # Requests may still be reading the previous view, so it is swapped
+        # in one assignment and left to be unmapped once unreferenced.
+        self._view = _Mapped(mm, json.loads(mm[meta_off:meta_off + meta_len]))
+        self._file_id = file_id
+        self.version = version
+
+    async def poll(self) -> bool:
+        """Reload in a worker thread when a check is due; return whether a snapshot is mapped."""
+        if time.monotonic() >= self._next_check:
+            await asyncio.to_thread(self.reload)
+        return self._view is not None
+
+    def entry(self, slug: str) -> Optional[dict]:
+        """Return a freshly decoded catalog entry for ``slug``."""
+        view = self._view
+        record = view.find(slug) if view is not None else None
+        return None if record is None else view.load(record[0], record[1])
+
+    def random_entry(self, difficulty: str) -> Optional[dict]:
+        """Return a freshly decoded random catalog entry of ``difficulty``."""
+        view = self._view
+        i = view.pick(difficulty.lower()) if view is not None else None
+        if i is None:
+            return None
+        record = view.record(i)
+        return view.load(record[0], record[1])
+
+    def detail(self, slug: str) -> Optional[dict]:
+        """Return the stored detail for ``slug`` or ``None`` if it is absent."""
+        view = self._view
+        record = view.find(slug) if view is not None else None
+        if record is None or not record[3]:
+            return None
+        return view.load(record[2], record[3])
+
+    def catalog(self) -> Optional[list[dict]]:
+        """Decode the whole problem list in published order, or ``None`` if nothing is mapped."""
+        view = self._view
+        if view is None:
+            return None
+        return [view.load(*view.record(i)[:2]) for i in view.table(view.meta["order"])]
+
+    def details(self) -> dict[str, dict]:
+        """Decode every stored detail keyed by slug."""
+        view = self._view
+        if view is None:
+            return {}
+        records = (view.record(i) for i in range(view.meta["count"]))
+        return {view.slug(r): view.load(r[2], r[3]) for r in records if r[3]}
+
+
+async def refresh(path: str, concurrency: int = 4) -> int:
+    """Fetch upstream data once and publish it as the next snapshot version."""
+    import app
+
+    catalog = await app.fetch_remote_problems()
+    previous = SnapshotReader(path, check_interval=0)
+    previous.reload()
+    if catalog is app.local_problems() and previous.catalog() is not None:
+        # Upstream is unavailable; keep serving the last good snapshot.
+        return previous.version
+    details = previous.details()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fill(slug: str) -> None:
+        async with sem:
+            detail = await app.fetch_remote_problem_detail(slug)
+        if detail.get("content"):
+            details[slug] = detail
+
+    slugs = {slug_of(p) for p in catalog}
+    await asyncio.gather(*(fill(s) for s in slugs if s not in details))
+    details = {s: d for s, d in details.items() if s in slugs}
+    version = (previous.version or 0) + 1
+    write_snapshot(path, catalog, details, version)
+    return version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish the shared problem snapshot.")
+    parser.add_argument("path", help="snapshot file read by the web workers")
+    parser.add_argument("--interval", type=float, default=0, help="seconds between refreshes; 0 runs once")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel detail requests")
+    args = parser.parse_args()
+    while True:
+        version = asyncio.run(refresh(args.path, args.concurrency))
+        print(f"published snapshot v{version} to {args.path}", flush=True)
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -296,3 +296,130 @@ async def test_fetch_problem_detail_snippets(monkeypatch):
     detail = await app.fetch_problem_detail("two-sum")
     assert detail["codeSnippets"]
     assert detail["codeSnippets"][0]["langSlug"] == "python"
+
+
+def test_loop_lag_metrics():
+    with TestClient(app.app) as c:
+        app.LOOP_LAG.observe(30.0)
+        data = c.get("/metrics/loop-lag").json()
+    assert data["count"] >= 1
+    assert data["max_ms"] >= 30.0
+    assert data["buckets"][-1]["le"] == "+Inf"
+    assert data["buckets"][-1]["count"] == data["count"]
+
+
+def test_complexity_quadratic():
+    code = (
+        "nums = eval(input().split('= ', 1)[1].split('], ')[0] + ']')\n"
+        "t = 0\n"
+        "for a in nums:\n"
+        "    for b in nums:\n"
+        "        t += a ^ b\n"
+        "print(t)\n"
+    )
+    resp = client.post("/complexity", json={
+        "code": code,
+        "language": "python",
+        "sampleCase": "Input: nums = [2,7,11,15], target = 9\nOutput: [0,1]",
+        # Start-up (~40-60 ms, measured once) jitters by tens of ms; smaller
+        # sizes run for little more than that and made the fit flaky.
+        "sizes": [1000, 2000, 4000],
+    })
+    data = resp.json()
+    assert [p["size"] for p in data["points"]] == [1000, 2000, 4000]
+    assert all(p["returncode"] == 0 for p in data["points"])
+    assert data["complexity"] in {"O(n^2)", "O(n^3)"}
+
+
+def test_complexity_requires_inputs():
+    resp = client.post("/complexity", json={"code": "print(1)", "language": "python"})
+    assert resp.status_code == 400
+
+
+def test_complexity_element_budget():
+    resp = client.post("/complexity", json={
+        "code": "print(1)",
+        "language": "python",
+        "sampleCase": "Input: grid = [[" + ",".join(["0"] * 1000) + "]]\nOutput: 0",
+        "sizes": [1000, 1000000],
+    })
+    assert resp.status_code == 400
+    assert "elements" in resp.json()["error"]
+
+
+def test_complexity_reports_baseline_timeout(monkeypatch):
+    monkeypatch.setitem(app.executor.TIMEOUTS, "python", 0.3)
+    resp = client.post("/complexity", json={
+        "code": "import time; time.sleep(5)",
+        "language": "python",
+        "sampleCase": "Input: nums = [1,2,3]\nOutput: 1",
+        "sizes": [10, 20],
+    })
+    data = resp.json()
+    assert data["timed_out"] is True
+    assert data["points"] == [] and data["complexity"] is None
+
+
+def test_complexity_explicit_inputs_subtract_startup():
+    resp = client.post("/complexity", json={
+        "code": "import sys; print(len(sys.stdin.read()))",
+        "language": "python",
+        "inputs": [{"size": 1, "input": "x"}, {"size": 2, "input": "xx"}],
+    })
+    data = resp.json()
+    assert data["baseline_ms"] > 0
+    assert data["timed_out"] is False
+    assert [p["size"] for p in data["points"]] == [1, 2]
+
+
+def test_complexity_rejects_negative_sizes():
+    grid = "[[" + ",".join(["1"] * 1000) + "]]"
+    resp = client.post("/complexity", json={
+        "code": "print(1)",
+        "language": "python",
+        "sampleCase": f"Input: grid = {grid}\nOutput: 0",
+        "sizes": [1000000, -1000000],
+    })
+    assert resp.status_code == 400
+    assert resp.json()["error"].startswith("sizes.1")
+    resp = client.post("/complexity", json={
+        "code": "print(1)",
+        "language": "python",
+        "inputs": [{"size": -1, "input": ""}, {"size": 2, "input": ""}],
+    })
+    assert resp.status_code == 400
+
+
+def test_complexity_request_has_no_profile_fields():
+    assert "profile" in app.ExecuteRequest.model_fields
+    assert not {"profile", "profileTop"} & set(app.ComplexityRequest.model_fields)
+
+
+def test_complexity_compile_error():
+    resp = client.post("/complexity", json={
+        "code": "int main( {",
+        "language": "cpp",
+        "inputs": [{"size": 1, "input": ""}, {"size": 2, "input": ""}],
+    })
+    assert resp.json()["returncode"] != 0
+
+
+def test_execute_profile_python():
+    code = "def f(n):\n    return sum(i * i for i in range(n))\nprint(f(200000))\n"
+    resp = client.post("/execute", json={"code": code, "language": "python", "profile": True, "profileTop": 5})
+    data = resp.json()
+    assert data["stdout"].strip() == str(sum(i * i for i in range(200000)))
+    profile = data["profile"]
+    assert any(fn["function"] == "f" and fn["file"] == "main.py" for fn in profile["functions"])
+    assert len(profile["functions"]) <= 5
+    assert profile["lines"] and profile["memory"]["peak_kb"] > 0
+
+
+def test_execute_without_profile_has_no_profile():
+    resp = client.post("/execute", json={"code": "print('hi')", "language": "python"})
+    assert "profile" not in resp.json()
+
+
+def test_execute_profile_requires_python():
+    resp = client.post("/execute", json={"code": "int main(){}", "language": "cpp", "profile": True})
+    assert resp.status_code == 400
@@ -0,0 +1,62 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import complexity
+
+
+def test_scale_input_list_and_scalar():
+    text = complexity.scale_input("nums = [2,7,11,15], target = 9", 100)
+    head, tail = text.split("], ")
+    nums = json.loads(head.split("= ")[1] + "]")
+    assert len(nums) == 100
+    assert all(2 <= v <= 15 for v in nums)
+    assert tail == "target = 9"
+
+
+def test_scale_input_string_keeps_alphabet():
+    text = complexity.scale_input('s = "abca"', 50)
+    value = json.loads(text.split("= ")[1])
+    assert len(value) == 50
+    assert set(value) <= {"a", "b", "c"}
+
+
+def test_scale_input_nested_lists():
+    text = complexity.scale_input("grid = [[1,0,1],[0,1,0]]", 20)
+    grid = json.loads(text.split("= ")[1])
+    assert len(grid) == 20
+    assert all(len(row) == 3 for row in grid)
+
+
+def test_scale_input_plain_integer():
+    assert complexity.scale_input("5", 1000) == "1000"
+
+
+def test_scaled_size_counts_nested_width():
+    assert complexity.scaled_size("nums = [1,2,3], k = 2", 100) == 100
+    assert complexity.scaled_size("grid = [[1,0,1],[0,1,0]]", 20) == 20 + 20 * 3
+    assert complexity.scaled_size('words = ["ab","abcd"]', 10) == 40
+    assert complexity.scaled_size("5", 1000) == 0
+    assert complexity.scaled_size("grid = [[1,0,1],[0,1,0]]", -20) == 0
+
+
+def test_scale_input_deterministic():
+    assert complexity.scale_input("[1,2,3]", 30) == complexity.scale_input("[1,2,3]", 30)
+
+
+def test_fit_growth_classes():
+    sizes = [1000, 2000, 4000, 8000, 16000]
+    assert complexity.fit_growth([(n, n * 0.01) for n in sizes])[0] == "O(n)"
+    assert complexity.fit_growth([(n, n * n * 1e-5) for n in sizes])[0] == "O(n^2)"
+    assert complexity.fit_growth([(n, 0.002 * n * (n.bit_length())) for n in sizes])[0] == "O(n log n)"
+
+
+def test_fit_growth_needs_two_points():
+    assert complexity.fit_growth([(1000, 5.0)]) == (None, {})
+
+
+def test_fit_growth_below_noise_floor():
+    assert complexity.fit_growth([(10, 0.1), (100, 0.2)])[0] == "O(1)"
@@ -0,0 +1,183 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app
+from dispatch import RunnerPool
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_runner(port: int, *args: str) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "runner.py", "--port", str(port), *args],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("runner did not start")
+
+
+@pytest.fixture
+def runners():
+    ports = [_free_port(), _free_port()]
+    procs = [_start_runner(p) for p in ports]
+    yield [f"http://127.0.0.1:{p}" for p in ports], procs
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+
+
+def test_dispatch_spreads_load(runners):
+    specs, _ = runners
+    pool = RunnerPool(specs)
+
+    async def run():
+        return await asyncio.gather(
+            *(pool.run("python", "import time; time.sleep(0.3); print('hi')") for _ in range(4))
+        )
+
+    results = asyncio.run(run())
+    assert all(r["stdout"].strip() == "hi" for r in results)
+    served = [httpx.get(f"{spec}/health").json()["served"] for spec in specs]
+    assert sum(served) == 4
+    assert all(n >= 1 for n in served)
+
+
+def test_dispatch_retries_when_runner_full():
+    port = _free_port()
+    proc = _start_runner(port, "--capacity", "1")
+    spec = f"http://127.0.0.1:{port}"
+    try:
+        async def run(pool):
+            return await asyncio.gather(
+                *(pool.run("python", "import time; time.sleep(0.3); print('hi')") for _ in range(2))
+            )
+
+        results = asyncio.run(run(RunnerPool([spec])))
+        assert [r["stdout"].strip() for r in results] == ["hi", "hi"]
+        assert httpx.get(f"{spec}/health").json()["served"] == 2
+
+        pool = RunnerPool([spec], busy_retries=0)
+        results = asyncio.run(run(pool))
+        assert sorted(r["stderr"] for r in results) == ["", "All runners are busy"]
+        assert pool.runners[0].down_until == 0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_dispatch_retries_on_runner_failure(runners):
+    specs, procs = runners
+    pool = RunnerPool(specs)
+    asyncio.run(pool.run("python", "print(1)"))
+    procs[0].kill()
+    procs[0].wait()
+    for _ in range(3):
+        result = asyncio.run(pool.run("python", "print('ok')"))
+        assert result["stdout"].strip() == "ok"
+
+
+def test_dispatch_read_timeout_not_retried(runners, monkeypatch):
+    specs, _ = runners
+    monkeypatch.setattr("executor.max_duration", lambda *a, **k: 0.0)
+    pool = RunnerPool(specs, slack=0.5)
+    result = asyncio.run(pool.run("python", "import time; time.sleep(1.5)"))
+    assert result["stderr"] == "Execution timed out"
+    assert all(r.down_until == 0 for r in pool.runners)
+    time.sleep(1.5)
+    assert sum(httpx.get(f"{spec}/health").json()["served"] for spec in specs) == 1
+
+
+def test_dispatch_bad_payload_keeps_runners_up(runners):
+    specs, _ = runners
+    pool = RunnerPool(specs)
+    for _ in range(2):
+        result = asyncio.run(pool.run("python", "print(len(input()))", stdin="\ud800"))
+        assert "Runner error" not in result["stderr"]
+    assert all(r.down_until == 0 for r in pool.runners)
+    assert asyncio.run(pool.run("python", "print('ok')"))["stdout"].strip() == "ok"
+
+
+def test_dispatch_runner_error_not_retried(monkeypatch):
+    posts = []
+
+    def handler(request):
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"languages": ["python"], "active": 0, "capacity": 4})
+        posts.append(request.url.host)
+        return httpx.Response(500)
+
+    monkeypatch.setattr(
+        "dispatch.Runner.client",
+        lambda self: httpx.AsyncClient(base_url=self.base_url, transport=httpx.MockTransport(handler)),
+    )
+    pool = RunnerPool(["http://a:1", "http://b:1"])
+    result = asyncio.run(pool.run("python", "print(1)"))
+    assert result["stderr"] == "Runner error: HTTP 500"
+    assert len(posts) == 1
+    assert all(r.down_until == 0 for r in pool.runners)
+
+
+def test_runner_client_is_reused(runners):
+    specs, _ = runners
+    pool = RunnerPool(specs)
+
+    async def run():
+        await pool.run("python", "print(1)")
+        clients = [r._client for r in pool.runners]
+        await pool.run("python", "print(2)")
+        assert [r._client for r in pool.runners] == clients
+        await pool.aclose()
+        assert all(r._client is None for r in pool.runners)
+
+    asyncio.run(run())
+
+
+def test_dispatch_no_runner_available():
+    pool = RunnerPool([f"http://127.0.0.1:{_free_port()}"])
+    result = asyncio.run(pool.run("python", "print(1)"))
+    assert result["returncode"] == 1
+    assert "No runner available" in result["stderr"]
+
+
+def test_dispatch_unsupported_language():
+    pool = RunnerPool(["http://127.0.0.1:1"])
+    assert asyncio.run(pool.run("ruby", "puts 1"))["stderr"] == "Unsupported language"
+
+
+def test_execute_uses_runner_pool(runners, monkeypatch):
+    specs, _ = runners
+    monkeypatch.setattr(app, "RUNNERS", RunnerPool(specs))
+    resp = TestClient(app.app).post("/execute", json={"code": "print(6 * 7)", "language": "python"})
+    assert resp.json()["stdout"].strip() == "42"
+
+
+def test_runner_pool_from_env():
+    assert RunnerPool.from_env(None) is None
+    assert RunnerPool.from_env(" ") is None
+    pool = RunnerPool.from_env("http://a:1, unix:///tmp/r.sock")
+    assert [r.spec for r in pool.runners] == ["http://a:1", "unix:///tmp/r.sock"]
+    assert pool.runners[1].uds == "/tmp/r.sock"
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import executor
+from workspace import WorkspacePool
+
+
+def test_run_python_timeout_wipes_workspace(monkeypatch, tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1)
+    monkeypatch.setattr(executor, "WORKSPACES", pool)
+    original = executor._exec
+
+    async def short_timeout(*cmd, timeout=None, **kwargs):
+        return await original(*cmd, timeout=0.2, **kwargs)
+
+    monkeypatch.setattr(executor, "_exec", short_timeout)
+    result = asyncio.run(executor.run_code("python", "open('junk', 'w').write('x')\nimport time\ntime.sleep(5)"))
+    assert result["stderr"] == "Execution timed out"
+    assert pool._free and os.listdir(pool._free[0]) == []
+
+
+def test_run_cpp_wipes_workspace(monkeypatch, tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1)
+    monkeypatch.setattr(executor, "WORKSPACES", pool)
+    result = asyncio.run(executor.run_code("cpp", "int main(){return 0;}"))
+    assert result["returncode"] == 0
+    assert os.listdir(pool._free[0]) == []
+
+
+def test_normalize_language():
+    assert executor.normalize_language("C++") == "cpp"
+    assert executor.normalize_language("Python") == "python"
+
+
+def test_available_languages_python_always():
+    assert "python" in executor.available_languages()
+
+
+def test_max_duration_covers_build_and_runs():
+    assert executor.max_duration("Python", runs=3) == executor.BUILD_TIMEOUT + 3 * executor.TIMEOUTS["python"]
+    assert executor.max_duration("c++", profile=True) == (
+        executor.BUILD_TIMEOUT + executor.TIMEOUTS["cpp"] * executor.PROFILE_TIMEOUT_FACTOR
+    )
+
+
+def test_run_code_handles_unencodable_text():
+    result = asyncio.run(executor.run_code("python", "import sys; print(sys.stdin.buffer.read())", "\ud800"))
+    assert result["stdout"].strip() == repr("\ud800".encode("utf-8", "surrogatepass"))
+    result = asyncio.run(executor.run_code("python", "print('\ud800')"))
+    assert result["returncode"] == 1
+    assert "SyntaxError" in result["stderr"]
+    result = asyncio.run(executor.run_code("python", "import sys; sys.stdout.buffer.write(b'\\xff')"))
+    assert result["stdout"] == "\ufffd"
+
+
+def test_run_series_measures_each_input():
+    results = asyncio.run(executor.run_series("python", "print(len(input()))", ["ab", "abcd"]))
+    assert [r["stdout"].strip() for r in results] == ["2", "4"]
+    assert all(r["time_ms"] > 0 and r["cpu_ms"] >= 0 for r in results)
+
+
+def test_run_series_stops_after_timeout(monkeypatch):
+    monkeypatch.setitem(executor.TIMEOUTS, "python", 0.5)
+    code = "import time\nn = int(input())\ntime.sleep(n)"
+    results = asyncio.run(executor.run_series("python", code, ["0", "2", "0"]))
+    assert len(results) == 2
+    assert "time_ms" in results[0]
+    assert results[1]["stderr"] == "Execution timed out"
+
+
+def test_run_code_profile_reports_allocations():
+    code = "data = [bytes(1024) for _ in range(2000)]\nprint(len(data))\n"
+    result = asyncio.run(executor.run_code("python", code, profile_top=3))
+    assert result["stdout"].strip() == "2000"
+    top = result["profile"]["memory"]["top"]
+    assert top[0]["line"] == 1
+    assert top[0]["size_kb"] > 1000
+
+
+def test_run_code_profile_keeps_exit_status():
+    result = asyncio.run(executor.run_code("python", "raise SystemExit(3)", profile_top=3))
+    assert result["returncode"] == 3
+    assert result["profile"] is not None
+
+
+def test_run_code_profile_reports_string_exit():
+    code = "import sys\nsys.exit('bad input')"
+    plain = asyncio.run(executor.run_code("python", code))
+    profiled = asyncio.run(executor.run_code("python", code, profile_top=3))
+    assert profiled["returncode"] == plain["returncode"] == 1
+    assert profiled["stderr"] == plain["stderr"] == "bad input\n"
+
+
+def test_workspace_total_size_enforced(monkeypatch, tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1, max_bytes=1024 * 1024)
+    monkeypatch.setattr(executor, "WORKSPACES", pool)
+    code = (
+        "import time\n"
+        "for i in range(50):\n"
+        "    open(f'f{i}', 'wb').write(b'x' * 1024 * 1024)\n"
+        "    time.sleep(0.01)\n"
+        "print('done')\n"
+    )
+    result = asyncio.run(executor.run_code("python", code))
+    assert result["returncode"] == 1
+    assert result["stderr"] == "Workspace size limit exceeded"
+    assert "done" not in result["stdout"]
+
+
+def test_workspace_total_checked_after_fast_exit(monkeypatch, tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1, max_bytes=1024 * 1024, poll_interval=60)
+    monkeypatch.setattr(executor, "WORKSPACES", pool)
+    code = "for i in range(4):\n    open(f'f{i}', 'wb').write(b'x' * 512 * 1024)\n"
+    result = asyncio.run(executor.run_code("python", code))
+    assert result["stderr"] == "Workspace size limit exceeded"
+
+
+def test_forked_child_cannot_write_into_next_run(monkeypatch, tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1)
+    monkeypatch.setattr(executor, "WORKSPACES", pool)
+    code = (
+        "import os, sys, time\n"
+        "if os.fork() == 0:\n"
+        "    os.close(0); os.close(1); os.close(2)\n"
+        "    time.sleep(0.3)\n"
+        "    open('planted', 'w').write('x')\n"
+        "    os._exit(0)\n"
+    )
+    asyncio.run(executor.run_code("python", code))
+    result = asyncio.run(executor.run_code("python", "import os, time; time.sleep(0.6); print(sorted(os.listdir()))"))
+    assert result["stdout"].strip() == "['main.py']"
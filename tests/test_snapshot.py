@@ -0,0 +1,131 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app
+import snapshot
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = tmp_path / "snap.bin"
+    catalog = [{"id": 1, "title": "Two Sum", "url": "https://leetcode.com/problems/two-sum/"}]
+    details = {"two-sum": {"content": "desc", "sampleTestCase": "case", "codeSnippets": []}}
+    snapshot.write_snapshot(str(path), catalog, details, version=3)
+
+    reader = snapshot.SnapshotReader(str(path))
+    reader.reload()
+    assert reader.catalog() == catalog
+    assert reader.version == 3
+    assert reader.detail("two-sum")["content"] == "desc"
+    assert reader.detail("missing") is None
+
+
+def test_snapshot_decodes_single_entries(tmp_path):
+    path = tmp_path / "snap.bin"
+    catalog = [
+        {"id": i, "title": f"P{i}", "difficulty": d, "url": f"https://leetcode.com/problems/p-{i}/"}
+        for i, d in enumerate(["Easy", "Hard", "Easy", "Medium", ""] * 20)
+    ]
+    snapshot.write_snapshot(str(path), catalog, {"p-7": {"content": "seven"}}, version=1)
+    reader = snapshot.SnapshotReader(str(path))
+    reader.reload()
+
+    assert reader.catalog() == catalog
+    assert reader.entry("p-42") == catalog[42]
+    assert reader.entry("missing") is None
+    assert reader.detail("p-7") == {"content": "seven"}
+    assert reader.detail("p-8") is None
+    assert reader.details() == {"p-7": {"content": "seven"}}
+    picked = {reader.random_entry("EASY")["id"] for _ in range(200)}
+    assert picked <= {p["id"] for p in catalog if p["difficulty"] == "Easy"}
+    assert len(picked) > 1
+    assert reader.random_entry("Impossible") is None
+    entry = reader.entry("p-1")
+    entry["content"] = "mutated"
+    assert "content" not in reader.entry("p-1")
+
+
+def test_snapshot_missing_file(tmp_path):
+    reader = snapshot.SnapshotReader(str(tmp_path / "absent.bin"))
+    reader.reload()
+    assert reader.catalog() is None
+    assert reader.detail("two-sum") is None
+
+
+def test_snapshot_swap(tmp_path):
+    path = tmp_path / "snap.bin"
+    snapshot.write_snapshot(str(path), [{"id": 1}], {}, version=1)
+    reader = snapshot.SnapshotReader(str(path), check_interval=0)
+    reader.reload()
+    assert reader.catalog() == [{"id": 1}]
+
+    snapshot.write_snapshot(str(path), [{"id": 2}], {}, version=2)
+    assert asyncio.run(reader.poll())
+    assert reader.catalog() == [{"id": 2}]
+    assert reader.version == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["snap.bin"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_problems_from_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "snap.bin"
+    catalog = [{"id": 9, "title": "Snap", "difficulty": "Easy", "url": "https://leetcode.com/problems/snap/"}]
+    snapshot.write_snapshot(str(path), catalog, {"snap": {"content": "from snapshot"}}, version=1)
+    monkeypatch.setattr(app, "SNAPSHOT", snapshot.SnapshotReader(str(path)))
+
+    async def fail(*a, **k):
+        raise AssertionError("upstream should not be called")
+
+    monkeypatch.setattr(app, "fetch_remote_problems", fail)
+    monkeypatch.setattr(app, "fetch_remote_problem_detail", fail)
+    assert await app.fetch_problems() == catalog
+    assert (await app.fetch_problem_detail("snap"))["content"] == "from snapshot"
+
+
+@pytest.mark.asyncio
+async def test_refresh_reuses_previous_details(tmp_path, monkeypatch):
+    path = tmp_path / "snap.bin"
+    old = {"two-sum": {"content": "cached"}}
+    snapshot.write_snapshot(str(path), [{"id": 1, "url": "https://leetcode.com/problems/two-sum/"}], old, version=4)
+    catalog = [
+        {"id": 1, "url": "https://leetcode.com/problems/two-sum/"},
+        {"id": 2, "url": "https://leetcode.com/problems/add-two-numbers/"},
+    ]
+    fetched = []
+
+    async def fake_problems():
+        return catalog
+
+    async def fake_detail(slug):
+        fetched.append(slug)
+        return {"content": f"new {slug}"}
+
+    monkeypatch.setattr(app, "fetch_remote_problems", fake_problems)
+    monkeypatch.setattr(app, "fetch_remote_problem_detail", fake_detail)
+    assert await snapshot.refresh(str(path)) == 5
+    assert fetched == ["add-two-numbers"]
+    reader = snapshot.SnapshotReader(str(path))
+    reader.reload()
+    assert reader.detail("two-sum")["content"] == "cached"
+    assert reader.detail("add-two-numbers")["content"] == "new add-two-numbers"
+
+
+def test_routes_do_not_mutate_snapshot_catalog(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    path = tmp_path / "snap.bin"
+    entry = {"id": 1, "title": "Two Sum", "difficulty": "Easy", "url": "https://leetcode.com/problems/two-sum/"}
+    detail = {"content": "desc", "sampleTestCase": "", "codeSnippets": []}
+    snapshot.write_snapshot(str(path), [entry], {"two-sum": detail}, version=1)
+    reader = snapshot.SnapshotReader(str(path))
+    monkeypatch.setattr(app, "SNAPSHOT", reader)
+
+    client = TestClient(app.app)
+    assert client.get("/random?difficulty=Easy").status_code == 200
+    assert client.get("/solve/two-sum").status_code == 200
+    assert reader.catalog() == [entry]
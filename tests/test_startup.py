@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import app
+
+
+def test_import_is_lazy_and_cwd_independent(tmp_path):
+    code = (
+        "import sys; sys.path.insert(0, %r); import app; "
+        "print('fastapi_mcp' in sys.modules, app.mcp_server is None, len(app.LOCAL_PROBLEMS) > 0)"
+    ) % str(ROOT)
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "True", "True"]
+
+
+def test_startup_within_budget():
+    out = subprocess.run(
+        [sys.executable, str(ROOT / "benchmarks" / "startup.py"), "--runs", "1"],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert out.returncode == 0, out.stdout + out.stderr
+
+
+def test_templates_compiled_once():
+    assert app.get_template(app.INDEX_HTML) is app.TEMPLATE
+    assert app.TEMPLATE is app.get_template(app.INDEX_HTML)
+
+
+def test_lifespan_mounts_mcp():
+    with TestClient(app.app):
+        deadline = time.monotonic() + 10
+        while app.mcp_server is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert app.mcp_server is not None
+        assert any(getattr(r, "path", "").startswith("/mcp") for r in app.app.routes)
+
+
+def test_deferred_startup_failure_is_logged(monkeypatch, caplog):
+    def broken():
+        raise RuntimeError("warm-up failed")
+
+    monkeypatch.setattr(app, "_warm_up", broken)
+    with TestClient(app.app):
+        deadline = time.monotonic() + 5
+        while "Deferred startup failed" not in caplog.text and time.monotonic() < deadline:
+            time.sleep(0.05)
+    assert "warm-up failed" in caplog.text
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import workspace
+from workspace import WorkspacePool
+
+
+def test_workspace_reused_and_wiped(tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1)
+
+    async def run():
+        async with pool.acquire() as ws:
+            os.mkdir(os.path.join(ws, "build"))
+            Path(ws, "build", "main.o").write_text("x")
+            first = ws
+        async with pool.acquire() as ws:
+            assert ws == first
+            assert os.listdir(ws) == []
+
+    asyncio.run(run())
+
+
+def test_workspace_overflow_is_ephemeral(tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1, overflow=1)
+
+    async def run():
+        async with pool.acquire() as pooled:
+            async with pool.acquire() as extra:
+                assert extra != pooled
+            assert not os.path.exists(extra)
+        assert pool._free == [pooled]
+
+    asyncio.run(run())
+
+
+def test_workspace_waits_when_pool_and_overflow_busy(tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1, overflow=1)
+    in_use = []
+    peak = [0]
+
+    async def borrow():
+        async with pool.acquire() as ws:
+            in_use.append(ws)
+            peak[0] = max(peak[0], len(in_use))
+            await asyncio.sleep(0.05)
+            in_use.remove(ws)
+
+    async def run():
+        await asyncio.gather(*(borrow() for _ in range(5)))
+
+    asyncio.run(run())
+    assert peak[0] == 2
+    assert pool._busy == 0
+    assert len(os.listdir(pool._base)) == 1
+
+
+def test_workspace_prewarm_and_close(tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=3)
+    pool.prewarm()
+    assert len(pool._free) == 3
+    assert all(os.path.isdir(p) for p in pool._free)
+    pool.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_workspace_file_size_cap(tmp_path):
+    pool = WorkspacePool(str(tmp_path), size=1, max_bytes=1024)
+
+    async def run():
+        async with pool.acquire() as ws:
+            cmd, kwargs = pool.limited([sys.executable, "-c", "open('big', 'wb').write(b'x' * 4096)"])
+            proc = await asyncio.create_subprocess_exec(*cmd, cwd=ws, stderr=asyncio.subprocess.PIPE, **kwargs)
+            await proc.communicate()
+            assert os.path.getsize(os.path.join(ws, "big")) <= 1024
+
+    asyncio.run(run())
+
+
+def test_workspace_file_size_cap_without_prlimit(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "PRLIMIT", None)
+    test_workspace_file_size_cap(tmp_path)
+
+
+def test_workspace_usage_counts_nested_files(tmp_path):
+    Path(tmp_path, "a").write_bytes(b"x" * 10000)
+    os.mkdir(tmp_path / "sub")
+    Path(tmp_path, "sub", "b").write_bytes(b"x" * 10000)
+    from workspace import usage
+    assert usage(str(tmp_path)) >= 20000
@@ -0,0 +1,199 @@
+"""Reusable per-run sandbox directories on a RAM-backed filesystem.
+
+Each execution borrows a workspace from the pool, writes its sources and build
+artifacts there and hands it back; the directory is then wiped and reused
+instead of being created and deleted on disk for every request.  When every
+pooled workspace is busy up to ``overflow`` ephemeral ones are created and
+removed afterwards; beyond that, runs wait for a workspace to be released.
+At most ``(size + overflow) * max_bytes`` is therefore ever in use, which is
+what the filesystem under ``root`` has to hold.
+
+The size of a workspace is bounded in two ways: no single file may exceed
+``max_bytes`` (``RLIMIT_FSIZE``, set in the child before exec so that it covers
+the first write and every process the run forks), and a watchdog kills the
+run's process group as soon as the total allocated under the workspace goes
+past ``max_bytes``.
+The watchdog polls, so a fast writer can overshoot by what it writes within
+one ``poll_interval``.
+"""
+
+import asyncio
+import collections
+import os
+import resource
+import shutil
+import signal
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence
+
+# Sets resource limits and execs the command, avoiding a preexec_fn (which is
+# unsafe with the worker threads of the web process) where available.
+PRLIMIT = shutil.which("prlimit")
+
+
+def default_root() -> str:
+    """Prefer ``/dev/shm`` when it is available, else the system temp dir."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def usage(path: str) -> int:
+    """Return the bytes actually allocated to files under ``path``."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_blocks * 512
+            except OSError:
+                pass
+    return total
+
+
+def _wipe(path: str) -> None:
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+class WorkspacePool:
+    """Fixed-size pool of workspaces under ``root``, each capped at ``max_bytes`` in total."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        size: int = 8,
+        max_bytes: int = 64 * 1024 * 1024,
+        poll_interval: float = 0.02,
+        overflow: int = 0,
+    ):
+        self.root = root or default_root()
+        self.size = size
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self.overflow = overflow
+        self._base: Optional[str] = None
+        self._free: list[str] = []
+        self._created = 0
+        self._busy = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    def _ensure_base(self) -> str:
+        if self._base is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._base = tempfile.mkdtemp(prefix="code-trainer-", dir=self.root)
+        return self._base
+
+    def _create(self, index: int) -> str:
+        path = os.path.join(self._ensure_base(), f"ws-{index}")
+        os.mkdir(path, 0o700)
+        return path
+
+    def prewarm(self) -> None:
+        """Create every pooled workspace up front."""
+        while self._created < self.size:
+            self._created += 1
+            self._free.append(self._create(self._created - 1))
+
+    def limited(self, cmd: Sequence[str]) -> tuple[list[str], dict]:
+        """Return ``cmd`` and subprocess options that cap any file it writes at ``max_bytes``.
+
+        The limit is set between fork and exec, through util-linux ``prlimit``
+        when it is installed and a ``preexec_fn`` otherwise.
+        """
+        if PRLIMIT:
+            return [PRLIMIT, f"--fsize={self.max_bytes}", "--", *cmd], {}
+        return list(cmd), {"preexec_fn": self._set_limit}
+
+    def _set_limit(self) -> None:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (self.max_bytes, self.max_bytes))
+
+    async def enforce(self, pid: int, path: str) -> bool:
+        """Kill the process group ``pid`` once ``path`` grows past ``max_bytes``.
+
+        Polls until cancelled; returns ``True`` if the group was killed.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if await asyncio.to_thread(usage, path) > self.max_bytes:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                return True
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _reserve(self) -> None:
+        while self._busy >= self.size + self.overflow:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken just before being cancelled: pass the slot on.
+                    self._wake_next()
+                raise
+        self._busy += 1
+
+    def _release(self) -> None:
+        self._busy -= 1
+        self._wake_next()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[str]:
+        """Borrow a clean workspace directory for the duration of a run.
+
+        Waits while ``size + overflow`` workspaces are already in use.
+        """
+        await self._reserve()
+        try:
+            pooled = True
+            if self._free:
+                path = self._free.pop()
+            elif self._created < self.size:
+                # Count it before yielding to the thread so concurrent runs
+                # cannot both claim the last pooled slot.
+                self._created += 1
+                path = await asyncio.to_thread(self._create, self._created - 1)
+            else:
+                pooled = False
+                path = await asyncio.to_thread(tempfile.mkdtemp, prefix="ws-", dir=self._ensure_base())
+            try:
+                yield path
+            finally:
+                if pooled:
+                    await asyncio.to_thread(_wipe, path)
+                    self._free.append(path)
+                else:
+                    await asyncio.to_thread(shutil.rmtree, path, True)
+        finally:
+            self._release()
+
+    def close(self) -> None:
+        """Remove all workspaces created by this pool."""
+        if self._base is not None:
+            shutil.rmtree(self._base, ignore_errors=True)
+            self._base = None
+        self._free.clear()
+        self._created = 0